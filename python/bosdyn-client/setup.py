@@ -21,7 +21,7 @@ setuptools.setup(
     packages=setuptools.find_packages('src'),
     package_dir={'': 'src'},
     package_data={'': ['*.pem']},
-    install_requires=['bosdyn-api>=1.1.2', 'bosdyn-core>=1.1.2', 'grpcio', 'pyjwt'],
+    install_requires=['bosdyn-api>=1.1.2', 'bosdyn-core>=1.1.2', 'cachetools', 'grpcio', 'pyjwt'],
     classifiers=[
         "Programming Language :: Python :: 3.6",
         "License :: Other/Proprietary License",
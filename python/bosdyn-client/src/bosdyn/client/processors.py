@@ -14,8 +14,13 @@ class AddRequestHeader(object):
     """Sets header fields common to all bosdyn.api requests."""
 
     def __init__(self, client_name_func):
-        """Constructor, takes function to access the client name to insert into request headers."""
-        self.get_client_name = client_name_func
+        """Constructor, takes the client name to insert into request headers, or a function to
+        access it."""
+        if callable(client_name_func):
+            self.get_client_name = client_name_func
+        else:
+            # A bound str.__str__ returns the constant without a Python-level function call.
+            self.get_client_name = client_name_func.__str__
 
     def _create_header(self):
         header = RequestHeader()
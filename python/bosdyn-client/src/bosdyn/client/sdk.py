@@ -6,31 +6,23 @@
 
 """Sdk is  a repository for settings typically common to a single developer and/or robot fleet."""
 from __future__ import absolute_import
+import fnmatch
+import functools
 import glob
+import hashlib
+import ipaddress
 import logging
 import os
 import platform
+import sys
+import time
+from types import MappingProxyType
 
-import datetime
-import jwt
-import pkg_resources
+import cachetools
 
-from .auth import AuthClient
 from .exceptions import Error
-from .directory import DirectoryClient
-from .estop import EstopClient
-from .image import ImageClient
-from .lease import LeaseClient
-from .log_annotation import LogAnnotationClient
-from .payload import PayloadClient
-from .power import PowerClient
 from .processors import AddRequestHeader
 from .robot import Robot
-from .robot_command import RobotCommandClient
-from .robot_id import RobotIdClient
-from .robot_state import RobotStateClient
-from .spot_check import SpotCheckClient
-from .time_sync import TimeSyncClient
 
 
 class SdkError(Error):
@@ -47,50 +39,155 @@ class UnableToLoadAppTokenError(SdkError):
 
 _LOGGER = logging.getLogger(__name__)
 
+_SECONDS_PER_DAY = 60 * 60 * 24
+
 BOSDYN_RESOURCE_ROOT = os.environ.get('BOSDYN_RESOURCE_ROOT',
                                       os.path.join(os.path.expanduser('~'), '.bosdyn'))
 
 
+def _safe_getuser():
+    """Returns the name of the current user, or a placeholder if it cannot be determined."""
+    import getpass
+    try:
+        return getpass.getuser()
+    # pylint: disable=broad-except
+    except Exception:
+        _LOGGER.warn('Could not get username')
+        return '<unknown host>'
+
+
+# Use the name of the host if available, username otherwise. Both are process-constants
+# that cost a syscall or more to look up, so resolve them once at import.
+_MACHINE_NAME = platform.node() or _safe_getuser()
+
+
+@functools.lru_cache(maxsize=None)
 def generate_client_name(prefix=''):
-    """Returns a descriptive client name for API clients with an optional prefix."""
+    """Returns a descriptive client name for API clients with an optional prefix.
+
+    The name only depends on the prefix and process-wide constants, so results are
+    memoized per prefix.
+    """
     import __main__
     try:
-        process_info = '{}-{}'.format(os.path.basename(__main__.__file__), os.getpid())
+        process_info = f'{os.path.basename(__main__.__file__)}-{os.getpid()}'
     except AttributeError:
-        process_info = '{}'.format(os.getpid())
-    machine_name = platform.node()
-    if not machine_name:
-        import getpass
-        try:
-            user_name = getpass.getuser()
-        # pylint: disable=broad-except
-        except Exception:
-            _LOGGER.warn('Could not get username')
-            user_name = '<unknown host>'
-    # Use the name of the host if available, username otherwise.
-    return '{}{}:{}'.format(prefix, machine_name or user_name, process_info)
-
-
-_DEFAULT_SERVICE_CLIENTS = [
-    AuthClient,
-    DirectoryClient,
-    EstopClient,
-    ImageClient,
-    LeaseClient,
-    LogAnnotationClient,
-    PayloadClient,
-    PowerClient,
-    RobotCommandClient,
-    RobotIdClient,
-    RobotStateClient,
-    SpotCheckClient,
-    TimeSyncClient,
-]
+        process_info = f'{os.getpid()}'
+    return f'{prefix}{_MACHINE_NAME}:{process_info}'
+
+
+if hasattr(os, 'register_at_fork'):
+    # A forked child has a new PID, so it must not reuse the parent's cached names.
+    os.register_at_fork(after_in_child=generate_client_name.cache_clear)
+
+
+def _canonicalize_address(address):
+    """Returns a canonical form of a robot address for use as a cache key.
+
+    Strips whitespace, lowercases hostnames, and normalizes bare IP addresses so trivial
+    variants of the same address do not create duplicate Robot objects.
+    """
+    address = address.strip().lower()
+    try:
+        address = str(ipaddress.ip_address(address))
+    except ValueError:
+        pass
+    return address
+
+
+# Cache of certificate bytes, keyed by the glob expression they were loaded from (None for the
+# distributed certificate). Avoids re-reading the same files when many Sdks share a cert.
+_CERT_CACHE = {}
+
+
+def _matching_cert_paths(resource_path_glob):
+    """Returns the list of file paths matching a certificate glob expression.
+
+    For simple patterns this scans the containing directory once, reusing the stat
+    information cached on each DirEntry instead of stat-ing every match a second time.
+    """
+    dir_part, file_pattern = os.path.split(resource_path_glob)
+    if '**' in resource_path_glob or glob.has_magic(dir_part):
+        # Recursive or directory-level patterns still need full glob expansion.
+        return [c for c in glob.iglob(resource_path_glob) if os.path.isfile(c)]
+    try:
+        with os.scandir(dir_part or '.') as entries:
+            # Like glob, only match hidden files if the pattern asks for them explicitly.
+            return [
+                entry.path
+                for entry in entries
+                if (not entry.name.startswith('.') or file_pattern.startswith('.')) and
+                fnmatch.fnmatch(entry.name, file_pattern) and entry.is_file()
+            ]
+    except OSError:
+        return []
+
+
+_DEFAULT_SERVICE_CLIENTS = None
+
+
+def _default_service_clients():
+    """Returns the standard list of service client classes, importing them on first use.
+
+    Deferring these imports keeps 'import bosdyn.client.sdk' cheap for programs that never
+    build a standard Sdk.
+    """
+    global _DEFAULT_SERVICE_CLIENTS
+    if _DEFAULT_SERVICE_CLIENTS is None:
+        from .auth import AuthClient
+        from .directory import DirectoryClient
+        from .estop import EstopClient
+        from .image import ImageClient
+        from .lease import LeaseClient
+        from .log_annotation import LogAnnotationClient
+        from .payload import PayloadClient
+        from .power import PowerClient
+        from .robot_command import RobotCommandClient
+        from .robot_id import RobotIdClient
+        from .robot_state import RobotStateClient
+        from .spot_check import SpotCheckClient
+        from .time_sync import TimeSyncClient
+        _DEFAULT_SERVICE_CLIENTS = [
+            AuthClient,
+            DirectoryClient,
+            EstopClient,
+            ImageClient,
+            LeaseClient,
+            LogAnnotationClient,
+            PayloadClient,
+            PowerClient,
+            RobotCommandClient,
+            RobotIdClient,
+            RobotStateClient,
+            SpotCheckClient,
+            TimeSyncClient,
+        ]
+    return _DEFAULT_SERVICE_CLIENTS
+
+
+_DEFAULT_REGISTRATIONS = None
+
+
+def _default_registrations():
+    """Returns (client_class, service_name, service_type) tuples for the default clients.
+
+    The class attributes are resolved once and reused, rather than re-walked on every
+    create_standard_sdk call.
+    """
+    global _DEFAULT_REGISTRATIONS
+    if _DEFAULT_REGISTRATIONS is None:
+        _DEFAULT_REGISTRATIONS = tuple((client, client.default_service_name, client.service_type)
+                                       for client in _default_service_clients())
+    return _DEFAULT_REGISTRATIONS
 
 
 def create_standard_sdk(client_name_prefix, service_clients=None, cert_resource_glob=None):
     """Return an Sdk with the most common configuration.
 
+    The returned Sdk's service registries are frozen once setup completes, so additional
+    clients must be passed via service_clients rather than registered afterwards with
+    register_service_client().
+
     Args:
         client_name_prefix -- prefix to pass to generate_client_name()
         service_clients -- List of service client classes to register in addition to the defaults.
@@ -101,13 +198,19 @@ def create_standard_sdk(client_name_prefix, service_clients=None, cert_resource_
     sdk = Sdk(name=client_name_prefix)
     client_name = generate_client_name(client_name_prefix)
     sdk.load_robot_cert(cert_resource_glob)
-    sdk.request_processors.append(AddRequestHeader(lambda: client_name))
+    # The client name is frozen at construction, so pass it directly rather than through a
+    # lambda that would be re-invoked on every outbound RPC.
+    sdk.request_processors.append(AddRequestHeader(client_name))
 
-    all_service_clients = _DEFAULT_SERVICE_CLIENTS
+    for client, service_name, service_type in _default_registrations():
+        sdk.register_service_client(client, service_type=service_type, service_name=service_name)
     if service_clients:
-        all_service_clients += service_clients
-    for client in all_service_clients:
-        sdk.register_service_client(client)
+        for client in service_clients:
+            sdk.register_service_client(client)
+    # Registration is complete, so freeze the registries into read-only views. Clients that
+    # need additional registrations should pass them via service_clients above.
+    sdk.service_type_by_name = MappingProxyType(sdk.service_type_by_name)
+    sdk.service_client_factories_by_type = MappingProxyType(sdk.service_client_factories_by_type)
     return sdk
 
 
@@ -118,11 +221,11 @@ class Sdk(object):
 
     def __init__(self, name=None):
         self.app_token = None
+        self._app_token_payload = None
         self.cert = None
         self.logger = logging.getLogger(name or 'bosdyn.Sdk')
         self.request_processors = []
         self.response_processors = []
-        self.request_processors = []
         self.service_client_factories_by_type = {}
         self.service_type_by_name = {}
         # Robots created by this Sdk, keyed by address.
@@ -143,6 +246,7 @@ class Sdk(object):
         """
         if self.app_token is None:
             raise UnsetAppTokenError
+        address = _canonicalize_address(address)
         if address in self.robots:
             return self.robots[address]
         robot = Robot(name=name or address)
@@ -160,10 +264,22 @@ class Sdk(object):
                 creation_func.
             service_name -- Name of the service. If None (default), will try to get the name from
                 creation_func.
+
+        Raises:
+            SdkError: If this Sdk's registries were frozen by create_standard_sdk.
         """
 
-        service_name = service_name or creation_func.default_service_name
-        service_type = service_type or creation_func.service_type
+        service_name = sys.intern(service_name or creation_func.default_service_name)
+        service_type = sys.intern(service_type or creation_func.service_type)
+
+        if (self.service_type_by_name.get(service_name) == service_type and
+                self.service_client_factories_by_type.get(service_type) is creation_func):
+            # Already registered identically; nothing to do.
+            return
+
+        if isinstance(self.service_type_by_name, MappingProxyType):
+            raise SdkError('This Sdk\'s service registries are frozen. Pass additional clients '
+                           'to create_standard_sdk(service_clients=...) instead.')
 
         self.service_type_by_name[service_name] = service_type
         self.service_client_factories_by_type[service_type] = creation_func
@@ -178,16 +294,40 @@ class Sdk(object):
                 Defaults to None.
         """
         self.cert = None
+        if resource_path_glob in _CERT_CACHE:
+            self.cert = _CERT_CACHE[resource_path_glob]
+            return
         if resource_path_glob is None:
-            self.cert = pkg_resources.resource_stream('bosdyn.client.resources', 'robot.pem').read()
+            try:
+                from importlib import resources
+                cert = resources.files('bosdyn.client.resources').joinpath(
+                    'robot.pem').read_bytes()
+            except (ImportError, AttributeError):
+                # importlib.resources.files() requires Python 3.9; fall back to the much more
+                # expensive pkg_resources, which scans all installed distributions on import.
+                import pkg_resources
+                cert = pkg_resources.resource_stream('bosdyn.client.resources',
+                                                     'robot.pem').read()
         else:
-            cert_paths = [c for c in glob.glob(resource_path_glob) if os.path.isfile(c)]
+            cert_paths = _matching_cert_paths(resource_path_glob)
             if not cert_paths:
-                raise IOError('No files matched "{}"'.format(resource_path_glob))
-            self.cert = bytes()
-            for cert_path in cert_paths:
+                raise IOError(f'No files matched "{resource_path_glob}"')
+            # Sizes are known up front, so fill a single pre-sized buffer in place rather
+            # than growing an accumulator.
+            sizes = [os.path.getsize(cert_path) for cert_path in cert_paths]
+            buf = bytearray(sum(sizes))
+            view = memoryview(buf)
+            offset = 0
+            for cert_path, size in zip(cert_paths, sizes):
                 with open(cert_path, 'rb') as cert_file:
-                    self.cert += cert_file.read()
+                    if cert_file.readinto(view[offset:offset + size]) != size:
+                        # The file shrank between stat and read; a partial read would leave
+                        # NUL padding in the buffer and poison the cert cache.
+                        raise IOError(f'Certificate file "{cert_path}" changed while reading')
+                offset += size
+            cert = bytes(buf)
+        _CERT_CACHE[resource_path_glob] = cert
+        self.cert = cert
 
     def load_app_token(self, resource_path):
         """Load an app token from a file, and set it on the SDK.
@@ -204,21 +344,46 @@ class Sdk(object):
         try:
             with open(os.path.expanduser(resource_path), 'rb') as token_file:
                 token = token_file.read().decode().strip()
-                log_token_time_remaining(token)
+                self._app_token_payload = log_token_time_remaining(token)
         except IOError as e:
             _LOGGER.exception(e)
             raise UnableToLoadAppTokenError(
-                'Unable to retrieve app token from "{}".'.format(resource_path))
+                f'Unable to retrieve app token from "{resource_path}".')
         except TypeError as e:
             _LOGGER.exception(e)
             raise UnsetAppTokenError
 
         self.app_token = token
 
+    @property
+    def app_token_exp(self):
+        """Expiration time of the loaded app token as an epoch timestamp, or None if unknown."""
+        if self._app_token_payload is None:
+            return None
+        return self._app_token_payload.get('exp')
+
+
+def _token_cache_ttu(_key, token_values, now):
+    """Expire cached token payloads at their own 'exp' claim."""
+    return token_values.get('exp', now + 3600)
+
+
+# Cache of decoded token payloads, keyed by a hash of the token string so raw tokens are not
+# held as dictionary keys. Entries are evicted once the token itself expires.
+if hasattr(cachetools, 'TLRUCache'):
+    _TOKEN_CACHE = cachetools.TLRUCache(maxsize=256, ttu=_token_cache_ttu, timer=time.time)
+else:
+    # cachetools < 5.0 (the newest release for Python 3.6) has no TLRUCache; fall back to a
+    # fixed one-hour lifetime instead of per-token expiry.
+    _TOKEN_CACHE = cachetools.TTLCache(maxsize=256, ttl=3600, timer=time.time)
+
 
 def decode_token(token):
     """Decodes a JWT token without verification.
 
+    Decoded payloads are cached, so repeated calls with the same token only pay for the
+    decode once. Failures are never cached.
+
     Args:
         token: A string representing a token.
 
@@ -229,13 +394,20 @@ def decode_token(token):
     Raises:
         UnableToLoadAppTokenError: If the token cannot be read.
     """
+    import jwt  # Deferred so users who never load a token don't pay for the import.
+    key = hashlib.sha256(token.encode()).hexdigest()
+    try:
+        return _TOKEN_CACHE[key]
+    except KeyError:
+        pass
     try:
         values = jwt.decode(token, verify=False)
-        return values
     except jwt.exceptions.DecodeError as e:
-        raise UnableToLoadAppTokenError('Incorrectly formatted token {} --- {}'.format(token, e))
+        raise UnableToLoadAppTokenError(f'Incorrectly formatted token {token} --- {e}')
     except Exception as e:
-        raise UnableToLoadAppTokenError('Problem decoding token {} --- {}'.format(token, e))
+        raise UnableToLoadAppTokenError(f'Problem decoding token {token} --- {e}')
+    _TOKEN_CACHE[key] = values
+    return values
 
 
 def log_token_time_remaining(token):
@@ -243,7 +415,10 @@ def log_token_time_remaining(token):
 
     Arguments:
         token: A jwt token
-    
+
+    Returns:
+        Dictionary of the decoded token payload, so callers can reuse it without re-decoding.
+
     Raises:
         UnableToLoadAppTokenError: If the token expiration information cannot be retrieved.
     """
@@ -251,18 +426,22 @@ def log_token_time_remaining(token):
     if 'exp' not in token_values:
         raise UnableToLoadAppTokenError("Unknown token expiration")
 
-    # Log time to expiration, with varying levels based on nearness.
-    expire_time = datetime.datetime.fromtimestamp(token_values['exp'])
-    time_to_expiration = expire_time - datetime.datetime.utcnow()
-    if time_to_expiration < datetime.timedelta(seconds=0):
+    # Log time to expiration, with varying levels based on nearness. Plain epoch arithmetic
+    # avoids building datetime/timedelta objects and the naive-vs-aware utcnow() pitfall.
+    expire_epoch = token_values['exp']
+    seconds_to_expiration = expire_epoch - time.time()
+    if seconds_to_expiration < 0:
         _LOGGER.error('Your application token has expired. Please contact '
                       'support@bostondynamics.com to request a new token.')
-    elif time_to_expiration <= datetime.timedelta(days=30):
-        _LOGGER.warning('Application token expires in {} days on {}. Please contact '
-                        'support@bostondynamics.com to request a new token before the '
-                        'current token expires.'.format(
-                            time_to_expiration.days,
-                            datetime.datetime.strftime(expire_time, '%Y/%m/%d')))
-    else:
-        _LOGGER.info('Application token expires on {}.'.format(
-            datetime.datetime.strftime(expire_time, '%Y/%m/%d')))
+    elif seconds_to_expiration <= 30 * _SECONDS_PER_DAY:
+        # The strftime argument is built eagerly, so skip it when the record would be filtered.
+        if _LOGGER.isEnabledFor(logging.WARNING):
+            _LOGGER.warning(
+                'Application token expires in %d days on %s. Please contact '
+                'support@bostondynamics.com to request a new token before the '
+                'current token expires.', seconds_to_expiration // _SECONDS_PER_DAY,
+                time.strftime('%Y/%m/%d', time.gmtime(expire_epoch)))
+    elif _LOGGER.isEnabledFor(logging.INFO):
+        _LOGGER.info('Application token expires on %s.',
+                     time.strftime('%Y/%m/%d', time.gmtime(expire_epoch)))
+    return token_values
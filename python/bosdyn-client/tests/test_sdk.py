@@ -4,6 +4,9 @@
 # is subject to the terms and conditions of the Boston Dynamics Software
 # Development Kit License (20191101-BDSDK-SL).
 
+import os
+import tempfile
+
 import pkg_resources
 import unittest
 
@@ -29,6 +32,17 @@ class ClientTest(unittest.TestCase):
         self.assertEqual(len(client.response_processors), 0)
 
 
+class ProcessorsTest(unittest.TestCase):
+
+    def test_add_request_header_accepts_string(self):
+        proc = bosdyn.client.processors.AddRequestHeader('constant-name')
+        self.assertEqual('constant-name', proc.get_client_name())
+
+    def test_add_request_header_accepts_callable(self):
+        proc = bosdyn.client.processors.AddRequestHeader(lambda: 'from-callable')
+        self.assertEqual('from-callable', proc.get_client_name())
+
+
 class SdkTest(unittest.TestCase):
     CA_CERT = """-----BEGIN CERTIFICATE-----
 Lovely Spam! Wonderful Spam!
@@ -75,6 +89,16 @@ Spam, Spam, Spam, Spam!
         self.assertNotIn(response_p, robot.request_processors)
         self.assertEqual(sdk.robots[kAddress], sdk.create_robot(kAddress))
 
+    def test_robot_address_canonicalization(self):
+        sdk = self._create_sdk()
+        robot = sdk.create_robot('Spot.Example.COM')
+        # Whitespace and casing variants of the same address must map to the same Robot.
+        self.assertEqual(robot, sdk.create_robot(' spot.example.com '))
+        self.assertEqual(len(sdk.robots), 1)
+        ip_robot = sdk.create_robot('192.168.80.3')
+        self.assertEqual(ip_robot, sdk.create_robot(' 192.168.80.3 '))
+        self.assertEqual(len(sdk.robots), 2)
+
     def test_robot_creation_without_app_token(self):
         sdk = self._create_sdk(app_token=None)
 
@@ -124,6 +148,19 @@ Spam, Spam, Spam, Spam!
         with self.assertRaises(IOError):
             sdk.load_robot_cert('this-path-does-not-exist')
 
+    def test_extra_clients_do_not_leak_into_defaults(self):
+        service_name = ServiceClientMock.default_service_name
+        sdk = bosdyn.client.create_standard_sdk('sdk-test', service_clients=[ServiceClientMock])
+        self.assertIn(service_name, sdk.service_type_by_name)
+        # A second standard Sdk must not inherit the first one's extra clients.
+        other_sdk = bosdyn.client.create_standard_sdk('sdk-test')
+        self.assertNotIn(service_name, other_sdk.service_type_by_name)
+
+    def test_register_after_standard_sdk_raises(self):
+        sdk = bosdyn.client.create_standard_sdk('sdk-test')
+        with self.assertRaises(bosdyn.client.sdk.SdkError):
+            sdk.register_service_client(ServiceClientMock)
+
     def test_load_app_token(self):
         sdk = bosdyn.client.Sdk()
 
@@ -133,6 +170,21 @@ Spam, Spam, Spam, Spam!
         with self.assertRaises(bosdyn.client.sdk.UnsetAppTokenError):
             sdk.load_app_token(None)
 
+    def test_app_token_exp(self):
+        sdk = bosdyn.client.Sdk()
+        self.assertIsNone(sdk.app_token_exp)
+
+        token_file = tempfile.NamedTemporaryFile('w', delete=False)
+        token_file.write(SdkHelpersTest.expired_token)
+        token_file.close()
+        try:
+            sdk.load_app_token(token_file.name)
+        finally:
+            os.unlink(token_file.name)
+        self.assertEqual(
+            sdk.app_token_exp,
+            bosdyn.client.sdk.decode_token(SdkHelpersTest.expired_token)['exp'])
+
 
 
 class SdkHelpersTest(unittest.TestCase):